@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+ClaudeMD Viewer Near-Duplicate Detector
+Groups CLAUDE.md files that are copies of the same template with small edits,
+so token totals can count each template once.
+
+Usage:
+    python3 claudemd_dedup.py ~/src ~/work              # scan folders like claudemd_index.py
+    python3 claudemd_dedup.py --index ~/.cache/claudemd-viewer/index.json
+
+Files are shingled into character n-grams (works for Japanese, which has no
+word boundaries), hashed into one-permutation MinHash signatures in
+vectorized batches and bucketed with LSH banding. Requires numpy.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from claudemd_index import DEFAULT_SNAPSHOT, ProjectIndex, estimate_tokens, load_index
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE = 8
+# Upper bound on shingles hashed in one vectorized batch
+BATCH_SHINGLES = 1 << 22
+
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_ROLLING_BASE = np.uint64(1000003)
+
+
+def load_documents(paths, index=None):
+    """Return {path: text} from files/folders and an optional index snapshot
+
+    Folders are scanned with ProjectIndex, so they yield the same CLAUDE.md
+    files as a claudemd_index.py snapshot of those folders.
+    """
+    projects = []
+    if index is not None:
+        data = load_index(index)
+        if data is None:
+            sys.exit(f"Could not read index snapshot: {index}")
+        projects += data["projects"]
+    folders = [p for p in paths if os.path.isdir(p)]
+    if folders:
+        scanned = ProjectIndex(folders)
+        scanned.scan()
+        projects += scanned.projects.values()
+    docs = {p["claudeMdPath"]: p["claudeMdContent"]
+            for p in projects if p["claudeMdContent"] is not None}
+    for path in (p for p in paths if os.path.isfile(p)):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                docs[os.path.abspath(path)] = f.read()
+        except OSError:
+            continue
+    return docs
+
+
+def shingle_hashes(text, k=DEFAULT_SHINGLE):
+    """Return 32-bit hashes of the character k-grams of text
+
+    Whitespace is collapsed and case folded first so reflowed or re-indented
+    copies still match. Repeated shingles are kept since they do not change
+    a minimum. Texts shorter than k become a single shingle.
+    """
+    normalized = " ".join(text.split()).lower()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < k:
+        codes = np.concatenate([codes, np.zeros(k - len(codes), dtype=np.uint64)])
+    n = len(codes) - k + 1
+    # Polynomial rolling hash over all windows at once; uint64 wraps around
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = h * _ROLLING_BASE + codes[j:j + n]
+    return (h ^ (h >> np.uint64(32))) & _MAX_HASH
+
+
+def _mix64(x):
+    """splitmix64 finalizer: spreads 32-bit shingle hashes over 64 bits"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class MinHasher:
+    """Computes MinHash signatures for many shingle sets at once
+
+    Uses one-permutation hashing: each shingle is hashed once, the high bits
+    pick one of num_perm bins and the low bits compete for that bin's minimum.
+    This costs O(shingles) instead of O(shingles x num_perm). Empty bins are
+    filled from the next non-empty bin to the right (densification), so short
+    files still get comparable signatures.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        self.num_perm = num_perm
+        self.seed = np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+
+    def signatures(self, shingle_sets):
+        """Return a (len(shingle_sets), num_perm) uint32 signature matrix"""
+        out = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < len(shingle_sets):
+            # Take as many documents as fit in one batch (at least one)
+            end, total = start, 0
+            while end < len(shingle_sets) and (end == start or total + len(shingle_sets[end]) <= BATCH_SHINGLES):
+                total += len(shingle_sets[end])
+                end += 1
+            out[start:end] = self._batch(shingle_sets[start:end])
+            start = end
+        return out
+
+    def _batch(self, batch):
+        n, bins = len(batch), self.num_perm
+        hashed = _mix64(np.concatenate(batch) + self.seed)
+        docs = np.repeat(np.arange(n), [len(s) for s in batch])
+        slots = docs * bins + ((hashed >> np.uint64(32)) % np.uint64(bins)).astype(np.int64)
+        values = (hashed & _MAX_HASH).astype(np.uint32)
+
+        # Minimum value per (doc, bin)
+        flat = np.full(n * bins, np.iinfo(np.uint32).max, dtype=np.uint32)
+        np.minimum.at(flat, slots, values)
+        filled = np.zeros(n * bins, dtype=bool)
+        filled[slots] = True
+        sig, filled = flat.reshape(n, bins), filled.reshape(n, bins)
+
+        # Densify: each empty bin borrows from the next filled bin, wrapping around
+        cols = np.arange(2 * bins)
+        source = np.where(np.tile(filled, 2), cols, 2 * bins)
+        source = np.minimum.accumulate(source[:, ::-1], axis=1)[:, ::-1][:, :bins] % bins
+        return np.take_along_axis(sig, source, axis=1)
+
+
+def choose_bands(num_perm, threshold):
+    """Pick (bands, rows) whose LSH threshold (1/b)^(1/r) is closest below threshold"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x != y:
+            self.parent[max(x, y)] = min(x, y)
+
+
+def similarity(signatures, i, others):
+    """Estimated Jaccard similarity between document i and each of others"""
+    return (signatures[others] == signatures[i]).mean(axis=1)
+
+
+def lsh_groups(signatures, threshold, bands, rows):
+    """Return groups of document indices whose signatures are near-duplicates"""
+    n = len(signatures)
+    uf = _UnionFind(n)
+    weights = np.random.default_rng(2).integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Boundaries between runs of equal band keys
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], n]
+        shared = ends - starts > 1
+        for lo, hi in zip(starts[shared], ends[shared]):
+            bucket = order[lo:hi]
+            # Verify against a leader rather than all pairs: large template
+            # buckets stay linear instead of quadratic
+            remaining = bucket
+            while len(remaining) > 1:
+                leader, rest = remaining[0], remaining[1:]
+                matched = similarity(signatures, leader, rest) >= threshold
+                for j in rest[matched]:
+                    uf.union(int(leader), int(j))
+                remaining = rest[~matched]
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def find_clusters(docs, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle=DEFAULT_SHINGLE):
+    """Cluster near-duplicate documents and summarize their token cost
+
+    The representative of each cluster is its largest member; the other
+    members' similarity is measured against it, and redundantTokens estimates
+    how many of their tokens repeat the representative.
+    """
+    paths = sorted(p for p, text in docs.items() if text.strip())
+    tokens = [estimate_tokens(docs[p]) for p in paths]
+    signatures = MinHasher(num_perm).signatures([shingle_hashes(docs[p], shingle) for p in paths])
+    bands, rows = choose_bands(num_perm, threshold)
+
+    clusters = []
+    for group in lsh_groups(signatures, threshold, bands, rows):
+        rep = max(group, key=lambda i: (tokens[i], -i))
+        others = [i for i in group if i != rep]
+        sims = similarity(signatures, rep, others)
+        members = [{"path": paths[rep], "similarity": 1.0, "tokens": tokens[rep]}]
+        members += sorted(({"path": paths[i], "similarity": round(float(s), 3), "tokens": tokens[i]}
+                           for i, s in zip(others, sims)),
+                          key=lambda m: (-m["similarity"], m["path"]))
+        clusters.append({
+            "representative": paths[rep],
+            "size": len(group),
+            "members": members,
+            "redundantTokens": int(sum(tokens[i] * s for i, s in zip(others, sims))),
+        })
+    clusters.sort(key=lambda c: (-c["redundantTokens"], c["representative"]))
+
+    total = sum(tokens)
+    redundant = sum(c["redundantTokens"] for c in clusters)
+    return {
+        "files": len(paths),
+        "threshold": threshold,
+        "totalTokens": total,
+        "uniqueTokens": total - redundant,
+        "clusters": clusters,
+    }
+
+
+def main():
+    """Find near-duplicate CLAUDE.md files and print clusters as JSON"""
+    parser = argparse.ArgumentParser(description="Detect near-duplicate CLAUDE.md files")
+    parser.add_argument("paths", nargs="*", help="CLAUDE.md files or folders to search")
+    parser.add_argument("--index", nargs="?", const=DEFAULT_SNAPSHOT,
+                        help="read contents from a claudemd_index.py snapshot")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum estimated Jaccard similarity")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="MinHash permutations")
+    parser.add_argument("--shingle", type=int, default=DEFAULT_SHINGLE, help="shingle length in characters")
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    if not args.paths and args.index is None:
+        parser.error("give paths to search or --index")
+
+    started = time.monotonic()
+    docs = load_documents(args.paths, args.index)
+    result = find_clusters(docs, args.threshold, args.num_perm, args.shingle)
+    elapsed = (time.monotonic() - started) * 1000
+    print(f"{result['files']} files, {len(result['clusters'])} clusters, "
+          f"{result['totalTokens'] - result['uniqueTokens']} redundant tokens in {elapsed:.1f}ms",
+          file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
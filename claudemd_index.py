@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+ClaudeMD Viewer Project Indexer
+Scans folders for projects the same way ProjectScanner.swift does, then keeps
+the index fresh from filesystem events instead of rescanning.
+
+Usage:
+    python3 claudemd_index.py ~/src ~/work            # scan (or warm start) and print JSON
+    python3 claudemd_index.py ~/src --watch           # keep the snapshot up to date
+
+File events come from watchdog when it is installed (FSEvents on macOS),
+otherwise from inotify on Linux.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+SNAPSHOT_VERSION = 2
+DEFAULT_SNAPSHOT = os.path.expanduser("~/.cache/claudemd-viewer/index.json")
+
+# Same defaults as AppSettings.default / ProjectScanner.swift
+DEFAULT_DEPTH = 3
+DEFAULT_EXCLUDES = [
+    "node_modules", ".git", "vendor", "venv", ".venv",
+    "__pycache__", "build", "dist", ".next",
+]
+PROJECT_MARKERS = [
+    "package.json", "Cargo.toml", "pyproject.toml",
+    "go.mod", "build.gradle", "Makefile",
+]
+MD_EXCLUDE_DIRS = {"node_modules", ".git", "build", "dist", "target", ".next", ".cache"}
+# Files in a project root whose change affects the project entry itself
+PROJECT_FILES = {"CLAUDE.md", "CLAUDE.local.md", ".claude", *PROJECT_MARKERS}
+# Directories FileManager treats as packages (.skipsPackageDescendants)
+PACKAGE_SUFFIXES = (".app", ".bundle", ".framework", ".plugin", ".xcodeproj", ".xcworkspace")
+
+
+def estimate_tokens(content):
+    """Estimate tokens the same way TokenEstimator.swift does (chars / 4)"""
+    if content is None:
+        return 0
+    return len(content) // 4
+
+
+def _is_hidden(name):
+    return name.startswith(".")
+
+
+def _list_dirs(path):
+    """Return the non-hidden subdirectories of path"""
+    try:
+        with os.scandir(path) as it:
+            return [entry.path for entry in it
+                    if not _is_hidden(entry.name) and entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def is_project(path):
+    """Return True if path looks like a project root"""
+    return (os.path.isfile(os.path.join(path, "CLAUDE.md"))
+            or os.path.exists(os.path.join(path, ".claude"))
+            or any(os.path.exists(os.path.join(path, m)) for m in PROJECT_MARKERS))
+
+
+def project_name(path):
+    """Use the package.json name if present, otherwise the directory name"""
+    try:
+        with open(os.path.join(path, "package.json"), encoding="utf-8") as f:
+            name = json.load(f).get("name")
+        if isinstance(name, str):
+            return name
+    except (OSError, ValueError, AttributeError):
+        pass
+    return os.path.basename(path)
+
+
+def sort_md_files(files):
+    """CLAUDE.md first, the rest alphabetically by file name"""
+    return sorted(files, key=lambda p: (os.path.basename(p) != "CLAUDE.md",
+                                        os.path.basename(p).lower(), p))
+
+
+def scan_markdown_files(project_path, dir_mtimes=None):
+    """Collect every .md file in a project, skipping build and dependency dirs
+
+    If dir_mtimes is given, the mtime of every walked directory is recorded
+    in it (before listing, so a racing change shows up as stale next time).
+    """
+    md_files = []
+    pending = [project_path]
+    while pending:
+        path = pending.pop()
+        if dir_mtimes is not None:
+            dir_mtimes[path] = _mtime(path)
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if _is_hidden(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in MD_EXCLUDE_DIRS and not entry.name.endswith(PACKAGE_SUFFIXES):
+                    pending.append(entry.path)
+            elif entry.name.endswith(".md"):
+                md_files.append(entry.path)
+    return sort_md_files(md_files)
+
+
+def build_project(path, md_files=None):
+    """Build a project entry with the same fields as Models/Project.swift"""
+    claude_md = os.path.join(path, "CLAUDE.md")
+    local_md = os.path.join(path, "CLAUDE.local.md")
+    has_claude_md = os.path.isfile(claude_md)
+    content = _read_text(claude_md) if has_claude_md else None
+    if md_files is None:
+        md_files = scan_markdown_files(path)
+    return {
+        "name": project_name(path),
+        "path": path,
+        "claudeMdPath": claude_md if has_claude_md else None,
+        "localMdPath": local_md if os.path.exists(local_md) else None,
+        "lastModified": _mtime(claude_md) if has_claude_md else None,
+        "tokenEstimate": estimate_tokens(content),
+        "hasClaudeDir": os.path.exists(os.path.join(path, ".claude")),
+        "claudeMdContent": content,
+        "availableMdFiles": md_files,
+    }
+
+
+class ProjectIndex:
+    """In-memory project index that can be updated one path at a time"""
+
+    def __init__(self, folders, depth=DEFAULT_DEPTH, excludes=None):
+        self.folders = [os.path.abspath(os.path.expanduser(f)) for f in folders]
+        self.depth = depth
+        self.excludes = set(DEFAULT_EXCLUDES if excludes is None else excludes)
+        self.projects = {}
+        # Directory mtimes saved with the snapshot so a warm start only
+        # re-walks what changed: non-project dirs walked for discovery, and
+        # per project the dirs walked for .md files plus package.json
+        self._scan_dirs = {}
+        self._project_state = {}
+
+    # Scanning
+
+    def scan(self):
+        """Full scan of every configured folder"""
+        self.projects = {}
+        self._scan_dirs = {}
+        self._project_state = {}
+        for folder in self.folders:
+            if os.path.isdir(folder):
+                self._discover(folder, folder, prune=False)
+
+    def _depth(self, path, root):
+        if path == root:
+            return 0
+        return os.path.relpath(path, root).count(os.sep) + 1
+
+    def _discover(self, path, root, prune=True):
+        """Walk path like ProjectScanner does and add any projects found
+
+        prune drops already-indexed projects nested under a new one. A full
+        scan starts empty and never descends into a project, so it passes
+        False to avoid a linear pass over the index per project.
+        """
+        depth = self._depth(path, root)
+        if path != root:
+            name = os.path.basename(path)
+            if depth > self.depth or name in self.excludes or _is_hidden(name):
+                return
+            if path in self.projects:
+                return  # Already indexed; file events keep it fresh
+            if is_project(path):
+                self._add_project(path, prune)
+                return  # Projects do not nest
+            if name.endswith(PACKAGE_SUFFIXES):
+                return
+        self._scan_dirs[path] = _mtime(path)
+        for child in _list_dirs(path):
+            self._discover(child, root, prune)
+
+    def _add_project(self, path, prune=True):
+        if prune:
+            self._remove_under(path, keep_root=True)
+        self.projects[path] = build_project(path, self._scan_markdown(path))
+
+    def _scan_markdown(self, project):
+        """scan_markdown_files that also records the project's directory mtimes"""
+        dir_mtimes = {}
+        md_files = scan_markdown_files(project, dir_mtimes)
+        self._project_state[project] = {
+            "dirs": dir_mtimes,
+            "packageJson": _mtime(os.path.join(project, "package.json")),
+        }
+        return md_files
+
+    def _remove_under(self, path, keep_root=False):
+        prefix = path.rstrip(os.sep) + os.sep
+        for key in [k for k in self.projects if k.startswith(prefix) or (k == path and not keep_root)]:
+            del self.projects[key]
+
+    # Lookups
+
+    def root_for(self, path):
+        """Return the configured folder that contains path"""
+        for folder in self.folders:
+            if path == folder or path.startswith(folder.rstrip(os.sep) + os.sep):
+                return folder
+        return None
+
+    def project_for(self, path):
+        """Return the project root that is path or one of its ancestors"""
+        probe = path
+        while True:
+            if probe in self.projects:
+                return probe
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                return None
+            probe = parent
+
+    def _is_pruned(self, path, start):
+        """True if any directory between start (exclusive) and path is skipped"""
+        rel = os.path.relpath(path, start)
+        if rel == ".":
+            return False
+        return any(_is_hidden(p) or p in self.excludes for p in rel.split(os.sep))
+
+    def should_watch(self, path):
+        """True if changes inside directory path can affect the index"""
+        project = self.project_for(path)
+        if project is not None:
+            rel = os.path.relpath(path, project)
+            return rel == "." or not any(_is_hidden(p) or p in MD_EXCLUDE_DIRS
+                                         for p in rel.split(os.sep))
+        root = self.root_for(path)
+        return (root is not None and self._depth(path, root) <= self.depth
+                and not self._is_pruned(path, root))
+
+    # Incremental updates
+
+    def apply(self, path):
+        """Update the entries affected by a change at path
+
+        Returns the directories that were (re)indexed so a watcher can start
+        watching them.
+        """
+        path = os.path.abspath(path)
+        project = self.project_for(path)
+        if project is not None:
+            return self._apply_in_project(project, path)
+
+        root = self.root_for(path)
+        if root is None or path == root:
+            return []
+        if not os.path.exists(path):
+            self._remove_under(path)
+            return []
+        if os.path.isdir(path):
+            if self._is_pruned(os.path.dirname(path), root):
+                return []
+            before = set(self.projects)
+            self._discover(path, root)
+            return [path] + [p for p in self.projects if p not in before and p != path]
+        # A file appeared or changed in a non-project dir: it may have become one
+        parent = os.path.dirname(path)
+        if (parent != root and self._depth(parent, root) <= self.depth
+                and not self._is_pruned(parent, root) and is_project(parent)):
+            self._add_project(parent)
+            return [parent]
+        return []
+
+    def _apply_in_project(self, project, path):
+        entry = self.projects[project]
+        if path == project or (os.path.dirname(path) == project
+                               and os.path.basename(path) in PROJECT_FILES):
+            return self._refresh_project(project)
+
+        rel = os.path.relpath(path, project)
+        if any(_is_hidden(p) or p in MD_EXCLUDE_DIRS for p in rel.split(os.sep)):
+            return []
+        md_files = entry["availableMdFiles"]
+        if os.path.isdir(path):
+            prefix = path + os.sep
+            kept = [f for f in md_files if not f.startswith(prefix)]
+            entry["availableMdFiles"] = sort_md_files(kept + scan_markdown_files(path))
+            return [path]
+        if path.endswith(".md"):
+            if os.path.isfile(path):
+                if path not in md_files:
+                    entry["availableMdFiles"] = sort_md_files(md_files + [path])
+            elif path in md_files:
+                md_files.remove(path)
+            else:
+                # A deleted directory ending in .md, or an unknown path
+                prefix = path + os.sep
+                entry["availableMdFiles"] = [f for f in md_files if not f.startswith(prefix)]
+        elif not os.path.exists(path):
+            prefix = path + os.sep
+            entry["availableMdFiles"] = [f for f in md_files if not f.startswith(prefix)]
+        return []
+
+    def _refresh_project(self, project):
+        """Re-read a project root after one of its marker files changed"""
+        root = self.root_for(project)
+        if os.path.isdir(project) and is_project(project):
+            self._rebuild(project, self.projects[project]["availableMdFiles"])
+            return []
+        # No longer a project: forget it and look for projects underneath
+        del self.projects[project]
+        if root is not None and os.path.isdir(project):
+            self._discover(project, root)
+            return [project]
+        return []
+
+    def _rebuild(self, project, md_files):
+        """Rebuild a project entry, reusing its known .md files"""
+        claude_md = os.path.join(project, "CLAUDE.md")
+        if os.path.isfile(claude_md):
+            md_files = sort_md_files(set(md_files) | {claude_md})
+        else:
+            md_files = [f for f in md_files if f != claude_md]
+        self.projects[project] = build_project(project, md_files)
+        state = self._project_state.setdefault(project, {"dirs": {}})
+        state["packageJson"] = _mtime(os.path.join(project, "package.json"))
+
+    # Serialization
+
+    def settings(self):
+        return {"folders": self.folders, "depth": self.depth, "excludes": sorted(self.excludes)}
+
+    def to_json(self):
+        """Projects sorted like ProjectScanner (newest CLAUDE.md first)"""
+        projects = sorted(self.projects.values(),
+                          key=lambda p: p["lastModified"] or 0, reverse=True)
+        state = {
+            "scanDirs": {d: m for d, m in self._scan_dirs.items() if d not in self.projects},
+            "projects": {p: s for p, s in self._project_state.items() if p in self.projects},
+        }
+        return {"version": SNAPSHOT_VERSION, "settings": self.settings(),
+                "projects": projects, "state": state}
+
+    def save(self, path):
+        """Write the snapshot atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Warm start from a snapshot taken with the same settings
+
+        Revalidation is stat-based: a project is re-walked and rebuilt only
+        if one of its directories changed mtime, and otherwise rebuilt only if
+        the CLAUDE.md or package.json mtime changed. Only
+        discovery directories whose mtime changed are walked again for new
+        projects. Returns the number of directories re-walked, or None if the
+        snapshot is missing or was taken with different settings.
+        """
+        data = load_index(path)
+        if (data is None or data.get("version") != SNAPSHOT_VERSION
+                or data.get("settings") != self.settings()):
+            return None
+        state = data["state"]
+        self.projects, self._scan_dirs, self._project_state = {}, {}, {}
+        rediscover, rewalked = [], 0
+        for entry in data["projects"]:
+            project = entry["path"]
+            saved = state["projects"].get(project, {"dirs": {}})
+            # The project root is among the saved dirs, and creating or
+            # deleting a marker, CLAUDE.md or .claude changes its mtime
+            changed = not saved["dirs"] or any(_mtime(d) != m for d, m in saved["dirs"].items())
+            if changed:
+                if not os.path.isdir(project):
+                    continue
+                if not is_project(project):
+                    rediscover.append(project)
+                    continue
+                md_files = self._scan_markdown(project)
+                rewalked += len(self._project_state[project]["dirs"])
+            else:
+                md_files = entry["availableMdFiles"]
+                self._project_state[project] = saved
+            if (changed
+                    or _mtime(os.path.join(project, "CLAUDE.md")) != entry["lastModified"]
+                    or _mtime(os.path.join(project, "package.json")) != saved.get("packageJson")):
+                self._rebuild(project, md_files)
+            else:
+                entry["availableMdFiles"] = md_files
+                self.projects[project] = entry
+
+        for directory, mtime in state["scanDirs"].items():
+            if directory in self.projects:
+                continue
+            current = _mtime(directory)
+            if current == mtime:
+                self._scan_dirs[directory] = mtime
+            elif current is not None:
+                rediscover.append(directory)
+        # Known projects are skipped, so only new projects are built
+        for directory in rediscover:
+            root = self.root_for(directory)
+            if root is not None and os.path.isdir(directory):
+                self._discover(directory, root)
+                rewalked += 1
+        return rewalked
+
+
+def load_index(path=DEFAULT_SNAPSHOT):
+    """Read a snapshot written by ProjectIndex.save, or None if unavailable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class InotifyWatcher:
+    """Minimal inotify wrapper that watches only directories the index cares about"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_CLOEXEC = 0o2000000
+    MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, should_watch):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._should_watch = should_watch
+        self._paths = {}
+
+    def watch_tree(self, path):
+        """Add watches for path and every subdirectory accepted by should_watch"""
+        if not os.path.isdir(path) or not self._should_watch(path):
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            return  # Vanished already, or out of watches (fs.inotify.max_user_watches)
+        self._paths[wd] = path
+        for child in _list_dirs(path):
+            self.watch_tree(child)
+
+    def events(self):
+        """Yield changed paths; None means events were lost and a rescan is needed"""
+        while True:
+            data = os.read(self._fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    yield None
+                    continue
+                if mask & self.IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                base = self._paths.get(wd)
+                if base is None:
+                    continue
+                yield os.path.join(base, os.fsdecode(name)) if name else base
+
+
+class WatchdogWatcher:
+    """watchdog-backed watcher (FSEvents on macOS, inotify on Linux)"""
+
+    # Events that can change what is on disk; opened/closed_no_write are
+    # triggered by our own reads and would loop
+    EVENT_TYPES = {"created", "deleted", "modified", "moved", "closed"}
+
+    def __init__(self, roots):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        self._queue = queue.Queue()
+        q = self._queue
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type not in WatchdogWatcher.EVENT_TYPES:
+                    return
+                if event.is_directory and event.event_type == "modified":
+                    return  # Children report their own events
+                q.put(event.src_path)
+                if getattr(event, "dest_path", None):
+                    q.put(event.dest_path)
+
+        self._observer = Observer()
+        for root in roots:
+            if os.path.isdir(root):
+                self._observer.schedule(Handler(), root, recursive=True)
+        self._observer.start()
+
+    def watch_tree(self, path):
+        pass  # Already recursive
+
+    def events(self):
+        while True:
+            yield self._queue.get()
+
+
+def make_watcher(index):
+    """Pick watchdog if installed, otherwise inotify"""
+    try:
+        return WatchdogWatcher(index.folders)
+    except ImportError:
+        pass
+    if not sys.platform.startswith("linux"):
+        sys.exit("--watch needs watchdog on this platform: pip install watchdog")
+    watcher = InotifyWatcher(index.should_watch)
+    for folder in index.folders:
+        watcher.watch_tree(folder)
+    return watcher
+
+
+def watch(index, snapshot, debounce=0.3):
+    """Apply filesystem events to the index and save after each quiet period"""
+    watcher = make_watcher(index)
+    changes = queue.Queue()
+    # Saving the snapshot must not count as a change when it lives in a watched folder
+    own_files = {os.path.abspath(snapshot), os.path.abspath(snapshot) + ".tmp"}
+
+    def pump():
+        for path in watcher.events():
+            if path is None or os.path.abspath(path) not in own_files:
+                changes.put(path)
+
+    threading.Thread(target=pump, daemon=True).start()
+    print(f"Watching {len(index.folders)} folder(s), {len(index.projects)} projects", file=sys.stderr)
+
+    while True:
+        pending = {changes.get()}
+        # Coalesce bursts (editors, git checkouts) into one update
+        while True:
+            try:
+                pending.add(changes.get(timeout=debounce))
+            except queue.Empty:
+                break
+
+        started = time.monotonic()
+        if None in pending:
+            index.scan()
+            for folder in index.folders:
+                watcher.watch_tree(folder)
+        else:
+            # Parents first so directory events subsume their children
+            for path in sorted(pending, key=len):
+                for directory in index.apply(path):
+                    watcher.watch_tree(directory)
+        index.save(snapshot)
+        elapsed = (time.monotonic() - started) * 1000
+        print(f"Updated {len(pending)} path(s) in {elapsed:.1f}ms", file=sys.stderr)
+
+
+def main():
+    """Build or warm-load the index, then optionally keep it updated"""
+    parser = argparse.ArgumentParser(description="Index CLAUDE.md projects")
+    parser.add_argument("folders", nargs="+", help="folders to scan")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="scan depth")
+    parser.add_argument("--exclude", action="append", help="directory name to skip (repeatable)")
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT, help="snapshot file")
+    parser.add_argument("--rescan", action="store_true", help="ignore the snapshot")
+    parser.add_argument("--watch", action="store_true", help="keep the index updated")
+    args = parser.parse_args()
+
+    index = ProjectIndex(args.folders, args.depth, args.exclude)
+    started = time.monotonic()
+    rewalked = None if args.rescan else index.load(args.snapshot)
+    if rewalked is None:
+        index.scan()
+    index.save(args.snapshot)
+    elapsed = (time.monotonic() - started) * 1000
+    if rewalked is None:
+        print(f"Scanned {len(index.projects)} projects in {elapsed:.1f}ms", file=sys.stderr)
+    else:
+        print(f"Loaded {len(index.projects)} projects in {elapsed:.1f}ms "
+              f"({rewalked} changed directories re-walked)", file=sys.stderr)
+
+    if args.watch:
+        try:
+            watch(index, args.snapshot)
+        except KeyboardInterrupt:
+            index.save(args.snapshot)
+    else:
+        json.dump(index.to_json(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+ClaudeMD Viewer Full-Text Search
+Stores scanned .md files in a SQLite FTS5 index (trigram tokenizer, so
+Japanese and partial words match) and answers queries with ranked snippets.
+
+Usage:
+    python3 claudemd_search.py update ~/src ~/work      # scan folders and index
+    python3 claudemd_search.py update --index           # index a claudemd_index.py snapshot
+    python3 claudemd_search.py query "pytest"
+
+Updates are incremental: files whose mtime is unchanged are skipped, and
+files whose content hash is unchanged only get their mtime refreshed.
+Requires SQLite 3.34+ for the trigram tokenizer.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from claudemd_index import DEFAULT_SNAPSHOT, ProjectIndex, estimate_tokens, load_index
+
+DEFAULT_DB = os.path.expanduser("~/.cache/claudemd-viewer/search.db")
+BATCH_SIZE = 500
+DEFAULT_LIMIT = 20
+# snippet() counts trigram tokens, roughly one per character; 64 is the maximum
+SNIPPET_TOKENS = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    project TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    tokens INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    path UNINDEXED, headings, content, tokenize = 'trigram'
+);
+"""
+
+# snippet() marks matches with these; they cannot appear in a typed query, so
+# later highlighting can tell marked text apart before the real markers go in
+MARK_OPEN, MARK_CLOSE = "\x01", "\x02"
+MARKED = re.compile(f"({MARK_OPEN}[^{MARK_CLOSE}]*{MARK_CLOSE})")
+
+HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+
+
+def connect(path=DEFAULT_DB):
+    """Open (and create if needed) the search database"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    try:
+        conn.executescript(SCHEMA)
+    except sqlite3.OperationalError as e:
+        sys.exit(f"SQLite {sqlite3.sqlite_version} cannot create the FTS5 trigram index: {e}")
+    return conn
+
+
+def extract_headings(text):
+    """Return markdown headings, one per line, ignoring fenced code blocks"""
+    headings, in_fence = [], False
+    for line in text.splitlines():
+        if FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING.match(line)
+            if match:
+                headings.append(match.group(1))
+    return "\n".join(headings)
+
+
+def collect_files(folders=None, snapshot=None):
+    """Return ({md path: project path}, scanned roots) from a scan or a snapshot"""
+    if snapshot is not None:
+        data = load_index(snapshot)
+        if data is None:
+            sys.exit(f"Could not read index snapshot: {snapshot}")
+        projects, roots = data["projects"], data["settings"]["folders"]
+    else:
+        index = ProjectIndex(folders)
+        index.scan()
+        projects, roots = index.projects.values(), index.folders
+    return {md: p["path"] for p in projects for md in p["availableMdFiles"]}, roots
+
+
+def update(conn, files, roots):
+    """Bring the index in line with files ({path: project}) found under roots
+
+    Only files of projects under roots (the ones this scan can find) are
+    removed when missing from files, so updating one folder leaves other
+    folders' entries alone. Returns counts of added/updated/touched/removed/
+    unchanged files.
+    """
+    prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+    known = {path: (file_id, mtime, digest, project) for file_id, path, mtime, digest, project
+             in conn.execute("SELECT id, path, mtime, sha256, project FROM files")}
+    stats = dict.fromkeys(("added", "updated", "touched", "removed", "unchanged"), 0)
+    writes = []
+
+    def flush():
+        with conn:  # One transaction per batch
+            for sql, params in writes:
+                conn.execute(sql, params)
+        writes.clear()
+
+    for path, project in files.items():
+        try:
+            mtime = os.stat(path).st_mtime
+            if path in known and known[path][1] == mtime:
+                stats["unchanged"] += 1
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if path in known:
+            file_id, _, old_digest, _ = known[path]
+            if old_digest == digest:
+                writes.append(("UPDATE files SET mtime = ? WHERE id = ?", (mtime, file_id)))
+                stats["touched"] += 1
+            else:
+                text = data.decode("utf-8", errors="replace")
+                writes.append(("UPDATE files SET project = ?, mtime = ?, sha256 = ?, tokens = ? WHERE id = ?",
+                               (project, mtime, digest, estimate_tokens(text), file_id)))
+                writes.append(("DELETE FROM docs WHERE rowid = ?", (file_id,)))
+                writes.append(("INSERT INTO docs (rowid, path, headings, content) VALUES (?, ?, ?, ?)",
+                               (file_id, path, extract_headings(text), text)))
+                stats["updated"] += 1
+        else:
+            text = data.decode("utf-8", errors="replace")
+            # The FTS row shares the rowid assigned to the files row
+            writes.append(("INSERT INTO files (path, project, mtime, sha256, tokens) VALUES (?, ?, ?, ?, ?)",
+                           (path, project, mtime, digest, estimate_tokens(text))))
+            writes.append(("INSERT INTO docs (rowid, path, headings, content) "
+                           "SELECT id, path, ?, ? FROM files WHERE path = ?",
+                           (extract_headings(text), text, path)))
+            stats["added"] += 1
+        if len(writes) >= BATCH_SIZE:
+            flush()
+
+    for path, (file_id, _, _, project) in known.items():
+        if project.startswith(prefixes) and (path not in files or not os.path.exists(path)):
+            writes.append(("DELETE FROM docs WHERE rowid = ?", (file_id,)))
+            writes.append(("DELETE FROM files WHERE id = ?", (file_id,)))
+            stats["removed"] += 1
+            if len(writes) >= BATCH_SIZE:
+                flush()
+    flush()
+    return stats
+
+
+def _phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _excerpt(text, terms, highlight, width=SNIPPET_TOKENS // 2):
+    """Cut text around the first term and highlight every term in the cut
+
+    Mirrors snippet() for LIKE matches; with the trigram tokenizer one
+    snippet token is about one character.
+    """
+    at = text.lower().find(terms[0].lower())
+    start = max(0, at - width)
+    end = max(at, 0) + len(terms[0]) + width
+    excerpt = ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+    return _highlight(excerpt, terms, highlight)
+
+
+def _highlight(text, terms, highlight):
+    """Mark terms outside text already marked with MARK_OPEN/MARK_CLOSE, then
+    swap the sentinels for the real highlight markers"""
+    if terms:
+        pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+        text = "".join(part if part.startswith(MARK_OPEN)
+                       else pattern.sub(lambda m: MARK_OPEN + m.group(0) + MARK_CLOSE, part)
+                       for part in MARKED.split(text))
+    open_mark, close_mark = highlight
+    return text.replace(MARK_OPEN, open_mark).replace(MARK_CLOSE, close_mark)
+
+
+def search(conn, query, limit=DEFAULT_LIMIT, highlight=("[", "]")):
+    """Return ranked matches as dicts with path, project, tokens and snippet
+
+    Every whitespace-separated term must match. The trigram tokenizer needs
+    at least three characters, so shorter terms (common in Japanese) fall
+    back to LIKE filtering. If every term is short there is nothing for bm25
+    to rank, so results are ordered by most recently modified instead.
+    """
+    terms = query.split()
+    if not terms:
+        return []
+    long_terms = [t for t in terms if len(t) >= 3]
+    short_terms = [t for t in terms if len(t) < 3]
+    likes = " AND ".join("docs.content LIKE ? ESCAPE '\\'" for _ in short_terms)
+    like_params = ["%" + re.sub(r"([%_\\])", r"\\\1", t) + "%" for t in short_terms]
+
+    if long_terms:
+        sql = ("SELECT files.path, files.project, files.tokens, "
+               "snippet(docs, 2, ?, ?, '…', ?) FROM docs JOIN files ON files.id = docs.rowid "
+               "WHERE docs MATCH ?" + (" AND " + likes if likes else "") +
+               " ORDER BY bm25(docs, 0.0, 5.0, 1.0) LIMIT ?")
+        match = " AND ".join(_phrase(t) for t in long_terms)
+        rows = conn.execute(sql, [MARK_OPEN, MARK_CLOSE, SNIPPET_TOKENS, match, *like_params, limit])
+        # snippet() only marks MATCH terms; mark the LIKE ones too
+        rows = [(path, project, tokens, _highlight(snippet, short_terms, highlight))
+                for path, project, tokens, snippet in rows]
+    else:
+        sql = ("SELECT files.path, files.project, files.tokens, docs.content "
+               "FROM docs JOIN files ON files.id = docs.rowid WHERE " + likes +
+               " ORDER BY files.mtime DESC LIMIT ?")
+        rows = [(path, project, tokens, _excerpt(content, short_terms, highlight))
+                for path, project, tokens, content in conn.execute(sql, [*like_params, limit])]
+    return [{"path": path, "project": project, "tokens": tokens, "snippet": snippet}
+            for path, project, tokens, snippet in rows]
+
+
+def main():
+    """Update the index or run a query"""
+    parser = argparse.ArgumentParser(description="Full-text search over CLAUDE.md files")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = commands.add_parser("update", help="scan and index .md files")
+    update_parser.add_argument("folders", nargs="*", help="folders to scan")
+    update_parser.add_argument("--index", nargs="?", const=DEFAULT_SNAPSHOT,
+                               help="use a claudemd_index.py snapshot instead of scanning")
+
+    query_parser = commands.add_parser("query", help="search indexed files")
+    query_parser.add_argument("text", help="terms that must all appear")
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="maximum results")
+    query_parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    started = time.monotonic()
+    if args.command == "update":
+        if not args.folders and args.index is None:
+            update_parser.error("give folders to scan or --index")
+        if args.folders and args.index is not None:
+            update_parser.error("give either folders to scan or --index, not both")
+        stats = update(conn, *collect_files(args.folders, args.index))
+        elapsed = (time.monotonic() - started) * 1000
+        summary = ", ".join(f"{count} {name}" for name, count in stats.items())
+        print(f"Indexed in {elapsed:.1f}ms: {summary}")
+        return
+
+    tty = sys.stdout.isatty() and not args.json
+    results = search(conn, args.text, args.limit, ("\033[1m", "\033[0m") if tty else ("[", "]"))
+    elapsed = (time.monotonic() - started) * 1000
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for result in results:
+            print(f"{result['path']}  ({result['tokens']} tokens)")
+            print(f"    {' '.join(result['snippet'].split())}")
+    print(f"{len(results)} result(s) in {elapsed:.1f}ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
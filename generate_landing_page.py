@@ -2,11 +2,37 @@
 """
 ClaudeMD Viewer Landing Page Generator
 Generates the landing page and outputs to dist/index.html
+
+Pass --screenshots DIR to replace the CSS mockup with a responsive gallery of
+real screenshots (requires Pillow).
 """
+import argparse
+import base64
+import hashlib
+import html as html_lib
+import json
 import os
-
-
-def generate_html():
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+DIST_DIR = "dist"
+SCREENSHOT_DIR = "screenshots"
+SCREENSHOT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+SCREENSHOT_WIDTHS = (480, 960, 1440)
+# (format, extension, MIME type, Pillow save options); the last one is the <img> fallback
+SCREENSHOT_FORMATS = (
+    ("AVIF", "avif", "image/avif", {"quality": 55}),
+    ("WEBP", "webp", "image/webp", {"quality": 82, "method": 6}),
+    ("PNG", "png", "image/png", {"optimize": True}),
+)
+# Must match the .shot img width rule: 36vh scaled by the image's aspect ratio
+SCREENSHOT_SIZES = "(max-width: 768px) 90vw, calc(36vh * {width} / {height})"
+LQIP_WIDTH = 24
+# Bump to invalidate every cached encode
+PIPELINE_VERSION = 1
+
+
+def generate_html(gallery_html=None):
     """Generate the HTML content for the landing page"""
     html = """<!DOCTYPE html>
 <html lang="en">
@@ -286,6 +312,31 @@ def generate_html():
             font-weight: 600;
         }
 
+        /* Screenshot Gallery */
+        .gallery {
+            display: flex;
+            gap: 20px;
+            justify-content: center;
+            max-width: 100%;
+            margin: 20px 0;
+            animation: fadeIn 1s ease 0.3s both;
+        }
+
+        /* Width comes from the height budget and --ratio, so the box is
+           sized before the image loads */
+        .shot img {
+            display: block;
+            width: calc(36vh * var(--ratio));
+            height: auto;
+            max-width: 100%;
+            aspect-ratio: var(--ratio);
+            border: 2px solid var(--dark-border);
+            border-radius: 16px;
+            background-size: cover;
+            box-shadow: 0 12px 40px rgba(0, 0, 0, 0.5),
+                        0 0 60px var(--glow);
+        }
+
         /* CTA Buttons */
         .cta-group {
             display: flex;
@@ -494,6 +545,10 @@ def generate_html():
                 max-width: 100%;
             }
 
+            .gallery .shot:not(:first-child) {
+                display: none;
+            }
+
             .features {
                 grid-template-columns: 1fr;
                 gap: 12px;
@@ -717,19 +772,178 @@ def generate_html():
 </body>
 </html>"""
 
+    if gallery_html:
+        # Swap the hand-built mockup for real screenshots
+        start = html.index("        <!-- App Preview Mockup -->")
+        end = html.index("        <!-- CTA -->")
+        html = html[:start] + gallery_html + "\n\n" + html[end:]
+
     return html
 
 
+def _encode(source, output, fmt, width, options):
+    """Resize source to width and save it as fmt (runs in a worker process)"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        if img.width != width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        img.save(output, fmt, **options)
+    return output
+
+
+def _encode_lqip(source, output):
+    """Save a tiny blurred placeholder (runs in a worker process)"""
+    from PIL import Image, ImageFilter, ImageOps
+
+    with Image.open(source) as img:
+        # Keep alpha so transparent window-shadow margins stay transparent
+        img = ImageOps.exif_transpose(img).convert("RGBA")
+        img.thumbnail((LQIP_WIDTH, LQIP_WIDTH * 4))
+        img.filter(ImageFilter.GaussianBlur(1)).save(output, "WEBP", quality=30)
+    return output
+
+
+def _cache_key(data, *params):
+    """Hash of the source bytes and encode parameters"""
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps([PIPELINE_VERSION, *params], sort_keys=True).encode())
+    return digest.hexdigest()[:12]
+
+
+def _alt_text(filename):
+    words = os.path.splitext(filename)[0].replace("_", " ").replace("-", " ").split()
+    return " ".join(words).capitalize() or "Screenshot"
+
+
+def build_screenshots(source_dir, dist_dir=DIST_DIR, jobs=None):
+    """Encode screenshots into dist/screenshots and return the gallery markup
+
+    Each image is encoded at every width in SCREENSHOT_WIDTHS (capped at the
+    source width) and in every supported format. Output names carry a hash of
+    the source bytes and encode parameters, so unchanged screenshots are not
+    re-encoded; stale outputs are removed.
+    """
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError:
+        sys.exit("--screenshots needs Pillow: pip install Pillow")
+
+    formats = [f for f in SCREENSHOT_FORMATS
+               if f[0] == "PNG" or features.check(f[0].lower())]
+    if not os.path.isdir(source_dir):
+        sys.exit(f"Screenshots directory not found: {source_dir}")
+    out_dir = os.path.join(dist_dir, SCREENSHOT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    shots, tasks = [], []
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.lower().endswith(SCREENSHOT_EXTENSIONS):
+            continue
+        source = os.path.join(source_dir, filename)
+        try:
+            with open(source, "rb") as f:
+                data = f.read()
+            with Image.open(source) as img:
+                width, height = ImageOps.exif_transpose(img).size
+        except OSError as e:
+            sys.exit(f"Could not read screenshot {source}: {e}")
+        stem = os.path.splitext(filename)[0]
+        widths = sorted({min(w, width) for w in SCREENSHOT_WIDTHS})
+
+        variants = {}
+        for fmt, ext, _mime, options in formats:
+            for w in widths:
+                name = f"{stem}-{_cache_key(data, fmt, w, options)}-{w}.{ext}"
+                variants[(fmt, w)] = name
+                if not os.path.exists(os.path.join(out_dir, name)):
+                    tasks.append((_encode, source, os.path.join(out_dir, name), fmt, w, options))
+        lqip = f"{stem}-{_cache_key(data, 'lqip', LQIP_WIDTH, 'RGBA')}-lqip.webp"
+        if not os.path.exists(os.path.join(out_dir, lqip)):
+            tasks.append((_encode_lqip, source, os.path.join(out_dir, lqip)))
+        shots.append({
+            "alt": _alt_text(filename),
+            "widths": widths,
+            "height": round(height * widths[-1] / width),
+            "variants": variants,
+            "lqip": lqip,
+        })
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(*task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                future.result()
+            except OSError as e:
+                sys.exit(f"Could not encode screenshot {task[1]}: {e}")
+
+    used = {name for shot in shots for name in shot["variants"].values()}
+    used |= {shot["lqip"] for shot in shots}
+    for name in os.listdir(out_dir):
+        if name not in used:
+            os.remove(os.path.join(out_dir, name))
+
+    print(f"Screenshots: {len(shots)} images, {len(tasks)} of {len(used)} files encoded")
+    return gallery_markup(shots, formats, out_dir)
+
+
+def _srcset(shot, fmt):
+    return ", ".join(f"{SCREENSHOT_DIR}/{shot['variants'][(fmt, w)]} {w}w" for w in shot["widths"])
+
+
+def gallery_markup(shots, formats, out_dir):
+    """Build <picture> elements with srcset, lazy loading and LQIP backgrounds"""
+    if not shots:
+        return ""
+    figures = []
+    for index, shot in enumerate(shots):
+        with open(os.path.join(out_dir, shot["lqip"]), "rb") as f:
+            placeholder = "data:image/webp;base64," + base64.b64encode(f.read()).decode()
+        fallback = formats[-1][0]
+        largest = shot["widths"][-1]
+        sizes = SCREENSHOT_SIZES.format(width=largest, height=shot["height"])
+        sources = "\n".join(
+            f'                    <source type="{mime}" srcset="{_srcset(shot, fmt)}" sizes="{sizes}">'
+            for fmt, _ext, mime, _options in formats[:-1])
+        # The first screenshot is above the fold, so only the rest load lazily
+        loading = "eager" if index == 0 else "lazy"
+        figures.append(f"""            <figure class="shot">
+                <picture>
+{sources}
+                    <img src="{SCREENSHOT_DIR}/{shot['variants'][(fallback, largest)]}"
+                         srcset="{_srcset(shot, fallback)}" sizes="{sizes}"
+                         width="{largest}" height="{shot['height']}"
+                         loading="{loading}" decoding="async"
+                         alt="{html_lib.escape(shot['alt'])}"
+                         style="--ratio: {largest} / {shot['height']}; background-image: url({placeholder})"
+                         onload="this.style.backgroundImage = 'none'">
+                </picture>
+            </figure>""")
+    return ("        <!-- Screenshot Gallery -->\n"
+            "        <div class=\"gallery\">\n" + "\n".join(figures) + "\n        </div>")
+
+
 def main():
     """Generate the landing page HTML file in dist directory"""
+    parser = argparse.ArgumentParser(description="Generate the landing page")
+    parser.add_argument("--screenshots", help="directory of screenshots for the gallery")
+    parser.add_argument("--jobs", type=int, help="parallel image encoders (default: CPU count)")
+    args = parser.parse_args()
+
     # Create dist directory if it doesn't exist
-    os.makedirs('dist', exist_ok=True)
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    # Encode screenshots (cached) and build the gallery
+    gallery_html = build_screenshots(args.screenshots, DIST_DIR, args.jobs) if args.screenshots else None
 
     # Generate HTML content
-    html_content = generate_html()
+    html_content = generate_html(gallery_html)
 
     # Save to dist/index.html
-    output_file = "dist/index.html"
+    output_file = os.path.join(DIST_DIR, "index.html")
     with open(output_file, "w", encoding="utf-8") as f:
         f.write(html_content)
 